@@ -1,3 +1,8 @@
 __version__ = "0.1.0"
 
 from bitslice.bitslice import Bitslice  # noqa
+
+try:
+    from bitslice._cython import FastBitslice  # noqa
+except ImportError:
+    pass
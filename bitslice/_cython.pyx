@@ -0,0 +1,358 @@
+# cython: language_level=3
+""" FastBitslice
+    Bitslice for values of at most 64 bits, stored and sliced as a C uint64_t.
+"""
+from libc.stdint cimport uint32_t, uint64_t
+
+cdef extern from *:
+    """
+    /* With BMI2 (e.g. CFLAGS=-mbmi2), extraction and insertion are a single
+       PEXT/PDEP instruction; otherwise fall back to mask and shift. */
+    #if defined(__BMI2__)
+    #include <immintrin.h>
+    static inline uint64_t bitslice_extract(uint64_t value, uint64_t mask,
+                                            uint32_t shift) {
+        return _pext_u64(value, mask);
+    }
+    static inline uint64_t bitslice_deposit(uint64_t value, uint64_t new,
+                                            uint64_t mask, uint32_t shift) {
+        return (value & ~mask) | _pdep_u64(new, mask);
+    }
+    #else
+    static inline uint64_t bitslice_extract(uint64_t value, uint64_t mask,
+                                            uint32_t shift) {
+        return (value & mask) >> shift;
+    }
+    static inline uint64_t bitslice_deposit(uint64_t value, uint64_t new,
+                                            uint64_t mask, uint32_t shift) {
+        return (value & ~mask) | ((new << shift) & mask);
+    }
+    #endif
+    """
+    uint64_t bitslice_extract(uint64_t value, uint64_t mask, uint32_t shift)
+    uint64_t bitslice_deposit(uint64_t value, uint64_t new, uint64_t mask,
+                              uint32_t shift)
+
+
+cdef inline uint64_t _width_mask(uint32_t size):
+    if size >= 64:
+        return <uint64_t> -1
+    return (<uint64_t> 1 << size) - 1
+
+
+cdef inline object _full(uint32_t size):
+    # 1 << size as a Python int, which does not overflow for size == 64
+    return (<object> 1) << size
+
+
+cdef inline FastBitslice _make(uint64_t value, uint32_t size):
+    cdef FastBitslice obj = FastBitslice.__new__(FastBitslice)
+    obj.value = value
+    obj.size = size
+    obj.full_mask = _width_mask(size)
+    return obj
+
+
+cdef inline object _pyint(object value):
+    if type(value) is FastBitslice:
+        return (<FastBitslice> value).value
+    return int(value)
+
+
+cdef inline object _operand(object value):
+    # Like a Bitslice, leave non-integer operands of % and ** as they are
+    if type(value) is FastBitslice:
+        return (<FastBitslice> value).value
+    return value
+
+
+cdef inline int _as_u64(object value, uint64_t *out) except -1:
+    """ Store value in out and return 1, or return 0 when it does not fit in a
+        uint64_t (negative or wider than 64 bits).
+    """
+    if type(value) is FastBitslice:
+        out[0] = (<FastBitslice> value).value
+        return 1
+    if type(value) is not int:
+        value = int(value)
+    try:
+        out[0] = value
+    except OverflowError:
+        return 0
+    return 1
+
+
+cdef int _decode(object key, uint64_t *mask, uint32_t *shift,
+                 uint32_t *size) except -1:
+    cdef Py_ssize_t start, stop
+    try:
+        if isinstance(key, slice):
+            start = key.start
+            stop = key.stop
+        else:
+            start = stop = key
+    except OverflowError:
+        start = stop = -1
+    if stop < 0 or start < stop or start >= 64:
+        if isinstance(key, slice):
+            raise IndexError(f"Invalid bit range {key.start}:{key.stop}")
+        raise IndexError(f"Invalid bit index {key}")
+    size[0] = <uint32_t> (start - stop + 1)
+    shift[0] = <uint32_t> stop
+    mask[0] = _width_mask(size[0]) << stop
+    return 0
+
+
+cdef class FastBitslice:
+    """ A FastBitslice is a Bitslice with a fixed size of at most 64 bits:
+        >>> val = FastBitslice(0xCAFEBABE, size=32)
+        >>> val[7:0]
+        0x00BE (190)
+        >>> val[3] = 0
+        >>> val
+        0xCAFEBAB6 (3405691574)
+
+        Results that do not fit in the size raise an error, negative results
+        are stored as two's complement:
+        >>> FastBitslice(255, size=8) + 1
+        Traceback (most recent call last):
+        ...
+        ValueError: A value of 256 cannot be represented in 8 bits
+        >>> FastBitslice(1, size=8) - 2
+        0x00FF (-1)
+
+        Unlike a Bitslice, a FastBitslice does not support aliases, sizes
+        above 64 bits or values without a size, and it is not registered as
+        a numbers.Integral.
+    """
+
+    cdef public uint64_t value
+    cdef readonly uint32_t size
+    cdef readonly uint64_t full_mask
+    cdef bint _signed
+
+    def __init__(self, value, uint32_t size, bint signed=False):
+        if size > 64:
+            raise ValueError(f"A FastBitslice supports at most 64 bits, got {size}")
+        val = int(value)
+        if val.bit_length() > size:
+            raise ValueError(f"A value of {value} cannot be represented in {size} bits")
+        self._signed = signed
+        if val < 0:
+            self._signed = True
+            val += _full(size)
+        self.value = val
+        self.size = size
+        self.full_mask = _width_mask(size)
+
+    cdef FastBitslice _checked(self, object result):
+        cdef FastBitslice obj
+        result = int(result)
+        if result.bit_length() > self.size:
+            raise ValueError(
+                f"A value of {result} cannot be represented in {self.size} bits"
+            )
+        if result < 0:
+            obj = _make(result + _full(self.size), self.size)
+            obj._signed = True
+            return obj
+        return _make(result, self.size)
+
+    def __repr__(self):
+        val = self.value
+        if self._signed:
+            val -= ((self.value >> (self.size - 1)) & 1) * _full(self.size)
+        return "0x%04X (%d)" % (self.value, val)
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+    def __bool__(self):
+        return self.value != 0
+
+    def __len__(self):
+        return self.size
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    @property
+    def signed(self):
+        sign = (self.value >> (self.size - 1)) & 1
+        return self.value - sign * _full(self.size)
+
+    def resize(self, uint32_t size):
+        cdef FastBitslice result
+        if size > 64:
+            raise ValueError(f"A FastBitslice supports at most 64 bits, got {size}")
+        if size < self.size:
+            return FastBitslice(self.signed, size=size)
+        result = _make(self.value, size)
+        if self.size and (self.value >> (self.size - 1)) & 1:
+            result.value |= result.full_mask ^ self.full_mask
+            result._signed = True
+        return result
+
+    def __getitem__(self, key):
+        cdef uint64_t mask
+        cdef uint32_t shift, size
+        _decode(key, &mask, &shift, &size)
+        return _make(bitslice_extract(self.value, mask, shift), size)
+
+    def __setitem__(self, key, value):
+        cdef uint64_t mask, new
+        cdef uint32_t shift, size
+        _decode(key, &mask, &shift, &size)
+        if not _as_u64(value, &new):
+            new = _pyint(value) & _width_mask(size)
+        new &= _width_mask(size)
+        self.value = bitslice_deposit(self.value, new, mask, shift)
+
+    def __add__(self, value):
+        cdef uint64_t b, r
+        if not _as_u64(value, &b):
+            return self._checked(self.value + _pyint(value))
+        r = self.value + b
+        if r < b or r > self.full_mask:
+            return self._checked(self.value + <object> b)
+        return _make(r, self.size)
+
+    def __sub__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or b > self.value:
+            return self._checked(self.value - _pyint(value))
+        return _make(self.value - b, self.size)
+
+    def __mul__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or (b and self.value > self.full_mask // b):
+            return self._checked(self.value * _pyint(value))
+        return _make(self.value * b, self.size)
+
+    def __truediv__(self, value):
+        return self.__floordiv__(value)
+
+    def __floordiv__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or b == 0:
+            return self._checked(self.value // _pyint(value))
+        return _make(self.value // b, self.size)
+
+    def __and__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b):
+            return self._checked(self.value & _pyint(value))
+        return _make(self.value & b, self.size)
+
+    def __or__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or b > self.full_mask:
+            return self._checked(self.value | _pyint(value))
+        return _make(self.value | b, self.size)
+
+    def __xor__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or b > self.full_mask:
+            return self._checked(self.value ^ _pyint(value))
+        return _make(self.value ^ b, self.size)
+
+    def __lshift__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b) or (
+            self.value and (b >= 64 or self.value > self.full_mask >> b)
+        ):
+            return self._checked(self.value << _pyint(value))
+        return _make(self.value << b if b < 64 else 0, self.size)
+
+    def __rshift__(self, value):
+        cdef uint64_t b
+        if not _as_u64(value, &b):
+            return self._checked(self.value >> _pyint(value))
+        return _make(self.value >> b if b < 64 else 0, self.size)
+
+    def __invert__(self):
+        return _make(self.value ^ self.full_mask, self.size)
+
+    def __neg__(self):
+        return self._checked(-(<object> self.value))
+
+    def __pos__(self):
+        return _make(self.value, self.size)
+
+    def __abs__(self):
+        return _make(self.value, self.size)
+
+    def __mod__(self, other):
+        return self._checked(self.value % _operand(other))
+
+    def __rmod__(self, other):
+        return self._checked(_operand(other) % self.value)
+
+    def __pow__(self, other, modulo=None):
+        return self._checked(pow(<object> self.value, _operand(other), modulo))
+
+    def __rpow__(self, other, modulo=None):
+        return self._checked(pow(_operand(other), <object> self.value, modulo))
+
+    def __round__(self, ndigits=None):
+        return self.value
+
+    def __trunc__(self):
+        return self.value
+
+    def __floor__(self):
+        return _make(self.value, self.size)
+
+    def __ceil__(self):
+        return _make(self.value, self.size)
+
+    def __radd__(self, value):
+        return value + self.value
+
+    def __rsub__(self, value):
+        return value - self.value
+
+    def __rmul__(self, value):
+        return value * self.value
+
+    def __rtruediv__(self, value):
+        return value / self.value
+
+    def __rfloordiv__(self, value):
+        return value // self.value
+
+    def __rand__(self, value):
+        return value & self.value
+
+    def __ror__(self, value):
+        return value | self.value
+
+    def __rxor__(self, value):
+        return value ^ self.value
+
+    def __rlshift__(self, value):
+        return value << self.value
+
+    def __rrshift__(self, value):
+        return value >> self.value
+
+    def __eq__(self, other):
+        return self.value == other
+
+    def __ne__(self, other):
+        return self.value != other
+
+    def __lt__(self, other):
+        return self.value < other
+
+    def __le__(self, other):
+        return self.value <= other
+
+    def __gt__(self, other):
+        return self.value > other
+
+    def __ge__(self, other):
+        return self.value >= other
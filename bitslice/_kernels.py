@@ -0,0 +1,32 @@
+""" Kernels
+    Mask and shift primitives used by BitsliceArray.
+
+    The same expressions work on Python ints, NumPy scalars and arrays. When
+    Numba is installed they are compiled, which fuses the array expressions
+    into a single loop without temporaries.
+"""
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def mask_shift_get(value, mask, shift):
+    """ Extract the bits selected by mask, shifted down to bit 0
+        >>> mask_shift_get(0xCAFE, 0xFF00, 8) == 0xCA
+        True
+    """
+    return (value & mask) >> shift
+
+
+def mask_shift_set(value, new, mask, shift):
+    """ Replace the bits selected by mask with new, shifted up from bit 0
+        >>> mask_shift_set(0xCAFE, 0x12, 0xFF00, 8) == 0x12FE
+        True
+    """
+    return (value & ~mask) | ((new << shift) & mask)
+
+
+if njit is not None:
+    mask_shift_get = njit(cache=True)(mask_shift_get)
+    mask_shift_set = njit(cache=True)(mask_shift_set)
@@ -0,0 +1,310 @@
+""" BitsliceArray and RegisterFile
+    Vectorized bit slicing of arrays of fixed-width values, backed by NumPy.
+"""
+from operator import index
+
+import numpy as np
+
+from bitslice._kernels import mask_shift_get, mask_shift_set
+from bitslice.bitslice import (
+    Bitslice,
+    _MASK_TABLE,
+    _mask_shift_size_int,
+    _mask_shift_size_slice,
+)
+
+
+class BitsliceArray(np.ndarray):
+    """ A BitsliceArray holds a batch of values of the same size:
+        >>> arr = BitsliceArray([0xCAFE, 0xBABE, 0x1234], size=16)
+        >>> arr
+        BitsliceArray([51966, 47806, 4660], size=16)
+        >>> arr.width
+        16
+
+        Values must fit in the given size, which is at most 64 bits:
+        >>> BitsliceArray([4, 8], size=3)
+        Traceback (most recent call last):
+        ...
+        ValueError: Values cannot be represented in 3 bits
+        >>> BitsliceArray([4, 8], size=65)
+        Traceback (most recent call last):
+        ...
+        ValueError: A BitsliceArray supports at most 64 bits, got 65
+        >>> BitsliceArray([1], size=-1)
+        Traceback (most recent call last):
+        ...
+        ValueError: A BitsliceArray size cannot be negative, got -1
+
+        Slicing selects the same bits from every value:
+        >>> arr[7:0]
+        BitsliceArray([254, 190, 52], size=8)
+        >>> arr[4]
+        BitsliceArray([1, 1, 1], size=1)
+
+        Bit positions are limited to the 64 bits of the underlying values:
+        >>> arr[70]
+        Traceback (most recent call last):
+        ...
+        IndexError: Invalid bit index 70
+        >>> arr[64:60]
+        Traceback (most recent call last):
+        ...
+        IndexError: Invalid bit range 64:60
+
+        Iterating yields the individual values as Bitslices:
+        >>> list(arr)
+        [0xCAFE (51966), 0xBABE (47806), 0x1234 (4660)]
+
+        Additional indices select the values to slice from:
+        >>> arr[15:8, 1:]
+        BitsliceArray([186, 18], size=8)
+        >>> arr[15:8, 0]
+        0x00CA (202)
+
+        Assign new values to bits or slices:
+        >>> arr[7:0] = 0
+        >>> arr
+        BitsliceArray([51712, 47616, 4608], size=16)
+        >>> arr[3:0, 1] = 5
+        >>> arr
+        BitsliceArray([51712, 47621, 4608], size=16)
+        >>> arr[0] = [1, 0, 1]
+        >>> arr
+        BitsliceArray([51713, 47620, 4609], size=16)
+
+        Only an integer or a hi:lo slice with integer bounds (hi >= lo) selects
+        bits. Any other key indexes the values, as for a NumPy array:
+        >>> arr[::-1]
+        BitsliceArray([4609, 47620, 51713], size=16)
+        >>> arr[1:3]
+        BitsliceArray([47620, 4609], size=16)
+        >>> arr[[True, False, True]]
+        BitsliceArray([51713, 4609], size=16)
+        >>> arr[...] = [1, 2, 3]
+        >>> arr
+        BitsliceArray([1, 2, 3], size=16)
+        >>> arr[:2] = 0x10000
+        Traceback (most recent call last):
+        ...
+        ValueError: Values cannot be represented in 16 bits
+
+        Operators work on all values at once:
+        >>> arr = BitsliceArray([1, 2, 3], size=4)
+        >>> arr + 1
+        BitsliceArray([2, 3, 4], size=4)
+        >>> arr & 2
+        BitsliceArray([0, 2, 2], size=4)
+        >>> ~arr
+        BitsliceArray([14, 13, 12], size=4)
+
+        Results wrap around to the size, like a hardware register:
+        >>> arr + 14
+        BitsliceArray([15, 0, 1], size=4)
+        >>> arr - 2
+        BitsliceArray([15, 0, 1], size=4)
+        >>> arr * 6
+        BitsliceArray([6, 12, 2], size=4)
+        >>> arr += 13
+        >>> arr
+        BitsliceArray([14, 15, 0], size=4)
+
+        Results written to a BitsliceArray through out= wrap to its size:
+        >>> _ = np.add(np.array([1, 2, 3], dtype=np.uint64), 14, out=arr)
+        >>> arr
+        BitsliceArray([15, 0, 1], size=4)
+    """
+
+    # Ufuncs whose result can exceed the size and is wrapped around
+    _WRAPPED_UFUNCS = frozenset(
+        (
+            np.add,
+            np.subtract,
+            np.multiply,
+            np.left_shift,
+            np.bitwise_or,
+            np.bitwise_xor,
+            np.invert,
+            np.negative,
+        )
+    )
+
+    def __new__(cls, values, size: int = 64):
+        if size > 64:
+            raise ValueError(f"A BitsliceArray supports at most 64 bits, got {size}")
+        if size < 0:
+            raise ValueError(f"A BitsliceArray size cannot be negative, got {size}")
+        obj = np.array(values, dtype=np.uint64).view(cls)
+        obj.width = size
+        if size < 64 and np.any(obj.view(np.ndarray) > _MASK_TABLE[size]):
+            raise ValueError(f"Values cannot be represented in {size} bits")
+        return obj
+
+    def __array_finalize__(self, obj):
+        self.width = getattr(obj, "width", 64)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.tolist()}, size={self.width})"
+
+    def __str__(self):
+        return str(self.view(np.ndarray))
+
+    def __iter__(self):
+        if self.ndim == 1:
+            for value in self.view(np.ndarray):
+                yield Bitslice(int(value), size=self.width)
+        else:
+            for row in self.view(np.ndarray):
+                row = row.view(self.__class__)
+                row.width = self.width
+                yield row
+
+    def _split_key(self, key):
+        """ Split a key into the bit mask, shift and size and the remaining
+            element index, or return None when the key does not select bits.
+        """
+        if type(key) is tuple:
+            if not key:
+                return None
+            bits, where = key[0], key[1:]
+        else:
+            bits, where = key, ()
+        if isinstance(bits, slice):
+            if (
+                bits.step is not None
+                or not isinstance(bits.start, (int, np.integer))
+                or not isinstance(bits.stop, (int, np.integer))
+                or bits.start < bits.stop
+            ):
+                return None
+            # Normalize NumPy integers so they don't end up in the shared caches
+            start, stop = index(bits.start), index(bits.stop)
+            if stop < 0 or start >= 64:
+                raise IndexError(f"Invalid bit range {start}:{stop}")
+            mask, shift, size = _mask_shift_size_slice(start, stop)
+        elif isinstance(bits, (int, np.integer)) and not isinstance(bits, bool):
+            bit = index(bits)
+            if not 0 <= bit < 64:
+                raise IndexError(f"Invalid bit index {bit}")
+            mask, shift, size = _mask_shift_size_int(bit)
+        else:
+            return None
+        return mask, shift, size, where
+
+    def __getitem__(self, key):
+        split = self._split_key(key)
+        if split is None:
+            return super().__getitem__(key)
+        mask, shift, size, where = split
+        data = self.view(np.ndarray)
+        if where:
+            data = data[where]
+        if np.ndim(data) == 0:
+            return Bitslice((int(data) & mask) >> shift, size=size)
+        result = mask_shift_get(data, np.uint64(mask), np.uint64(shift))
+        result = result.view(self.__class__)
+        result.width = size
+        return result
+
+    def __setitem__(self, key, value):
+        split = self._split_key(key)
+        data = self.view(np.ndarray)
+        value = np.asarray(value, dtype=np.uint64)
+        if split is None:
+            if self.width < 64 and np.any(value > _MASK_TABLE[self.width]):
+                raise ValueError(f"Values cannot be represented in {self.width} bits")
+            data[key] = value
+            return
+        mask, shift, size, where = split
+        if not where:
+            where = Ellipsis
+        data[where] = mask_shift_set(
+            data[where], value, np.uint64(mask), np.uint64(shift)
+        )
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        width = next(
+            x.width
+            for x in inputs + kwargs.get("out", ())
+            if isinstance(x, BitsliceArray)
+        )
+        inputs = tuple(
+            x.view(np.ndarray) if isinstance(x, BitsliceArray) else x for x in inputs
+        )
+        out = kwargs.get("out")
+        if out:
+            kwargs["out"] = tuple(
+                x.view(np.ndarray) if isinstance(x, BitsliceArray) else x for x in out
+            )
+
+        result = getattr(ufunc, method)(*inputs, **kwargs)
+        if (
+            method != "__call__"
+            or not isinstance(result, np.ndarray)
+            or result.dtype != np.uint64
+        ):
+            return result
+
+        if ufunc in self._WRAPPED_UFUNCS and width < 64:
+            np.bitwise_and(result, np.uint64(_MASK_TABLE[width]), out=result)
+        if out and isinstance(out[0], BitsliceArray):
+            return out[0]
+        result = result.view(self.__class__)
+        result.width = width
+        return result
+
+
+class RegisterFile:
+    """ A RegisterFile stores a number of equally sized registers in a single
+        BitsliceArray:
+        >>> rf = RegisterFile(4, width=16)
+        >>> rf[1, 7:0] = 0xBE
+        >>> rf[1, 15:8] = 0xBA
+        >>> rf[1]
+        0xBABE (47806)
+        >>> rf[1, 11:4]
+        0x00AB (171)
+        >>> rf[2] = 0x1234
+        >>> rf.data
+        BitsliceArray([0, 47806, 4660, 0], size=16)
+
+        Whole-register values must fit in the width, while bit ranges keep
+        only the bits that fit, as for a Bitslice:
+        >>> rf[0] = 0x10000
+        Traceback (most recent call last):
+        ...
+        ValueError: Values cannot be represented in 16 bits
+        >>> rf[0, 3:0] = 0x1F
+        >>> rf[0]
+        0x000F (15)
+
+        Registers can be read and updated together:
+        >>> rf[:, 0] = 1
+        >>> rf.data
+        BitsliceArray([15, 47807, 4661, 1], size=16)
+        >>> rf[1:3, 3:0]
+        BitsliceArray([15, 5], size=4)
+    """
+
+    def __init__(self, n_regs: int, width: int = 64):
+        self.width = width
+        self.data = BitsliceArray(np.zeros(n_regs, dtype=np.uint64), size=width)
+
+    def __len__(self):
+        return len(self.data)
+
+    def _key(self, key):
+        if type(key) is tuple:
+            reg, bits = key
+        else:
+            reg, bits = key, slice(self.width - 1, 0)
+        return bits, reg
+
+    def __getitem__(self, key):
+        return self.data[self._key(key)]
+
+    def __setitem__(self, key, value):
+        if type(key) is not tuple and self.width < 64:
+            if np.any(np.asarray(value, dtype=np.uint64) > _MASK_TABLE[self.width]):
+                raise ValueError(f"Values cannot be represented in {self.width} bits")
+        self.data[self._key(key)] = value
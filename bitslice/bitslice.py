@@ -1,8 +1,27 @@
 """ Bitslice
     VHDL/Verilog-like bit slicing of integer values.
 """
+from functools import lru_cache
 from numbers import Integral
 from math import ceil, floor, trunc
+from operator import index
+
+# Precomputed masks for the most common widths. Wider masks are built as
+# (1 << width) - 1, which is at least as fast as ~(-1 << width) for big ints.
+_MASK_TABLE = tuple((1 << i) - 1 for i in range(129))
+_BIT_TABLE = tuple(1 << i for i in range(256))
+
+
+@lru_cache(maxsize=256)
+def _mask_shift_size_int(key):
+    return _BIT_TABLE[key] if 0 <= key < 256 else 1 << key, key, 1
+
+
+@lru_cache(maxsize=256)
+def _mask_shift_size_slice(start, stop):
+    size = (start - stop) + 1
+    mask = _MASK_TABLE[size] if 0 <= size < 129 else (1 << size) - 1
+    return mask << stop, stop, size
 
 
 class Bitslice(Integral):
@@ -88,6 +107,10 @@ class Bitslice(Integral):
         0x000F (15)
         >>> val2 | 1
         0x000D (13)
+        >>> val2 | 0x100
+        Traceback (most recent call last):
+        ...
+        ValueError: A value of 268 cannot be represented in 8 bits
 
         >>> val1 ^ val2
         0x000B (11)
@@ -180,6 +203,8 @@ class Bitslice(Integral):
         >>> b[5] = a[3]
         >>> b
         0x0024 (36)
+        >>> len(b)
+        6
 
         Formatting as ints:
         >>> a = Bitslice(14)
@@ -210,6 +235,14 @@ class Bitslice(Integral):
         >>> b = a.resize(5)
         >>> b
         0x001E (-2)
+        >>> b.resize(2)
+        0x0002 (-2)
+        >>> Bitslice(3, size=3).resize(8)
+        0x0003 (3)
+        >>> Bitslice(3, size=3).resize(1)
+        Traceback (most recent call last):
+        ...
+        ValueError: A value of 3 cannot be represented in 1 bits
 
         Aliases
         >>> a = Bitslice(14, size=8)
@@ -235,49 +268,86 @@ class Bitslice(Integral):
 
     """
 
+    __slots__ = (
+        "value",
+        "size",
+        "_signed",
+        "_aliases",
+        "_len",
+        "_full",
+        "_full_mask",
+    )
+
     def __init__(self, value: int, size: int = None, signed: bool = False):
+        val = int(value)
         self._signed = signed
         self._aliases = {}
-        self.value = int(value)
-        if self.value < 0:
-            self._signed = True
-            if size is None:
-                raise ValueError("Size must be set when the value is signed")
         self.size = size
 
-        if size is not None and int(value) > (1 << size) - 1:
+        if size is None:
+            if val < 0:
+                raise ValueError("Size must be set when the value is signed")
+            self.value = val
+            self._len = val.bit_length()
+            self._full = self._full_mask = None
+            return
+
+        if val.bit_length() > size:
             raise ValueError(f"A value of {value} cannot be represented in {size} bits")
 
-        if self._signed and self.value < 0:
-            self.value = (1 << self.size) + self.value
+        self._len = size
+        self._full = _BIT_TABLE[size] if size < 256 else 1 << size
+        self._full_mask = _MASK_TABLE[size] if size < 129 else self._full - 1
+        if val < 0:
+            self._signed = True
+            val += self._full
+        self.value = val
+
+    @classmethod
+    def _fast(cls, value, size):
+        """ Create a Bitslice of a value that is known to fit in size bits,
+            skipping validation.
+        """
+        obj = cls.__new__(cls)
+        obj.value = value
+        obj.size = size
+        obj._signed = False
+        obj._aliases = {}
+        obj._len = size
+        obj._full = _BIT_TABLE[size] if size < 256 else 1 << size
+        obj._full_mask = _MASK_TABLE[size] if size < 129 else obj._full - 1
+        return obj
 
     def __repr__(self):
         val = self.value
-        if self._signed and self[self.size - 1] == 1:
-            val = val - (1 << self.size)
-        return f"0x{self.value:04X} ({val})"
+        if self._signed:
+            val -= ((val >> (self.size - 1)) & 1) * self._full
+        return "0x%04X (%d)" % (self.value, val)
 
     def __format__(self, format_spec):
+        if not format_spec:
+            return str(self.value)
         return int.__format__(self.value, format_spec)
 
     def __len__(self):
-        if self.size is not None:
-            return self.size
-        else:
-            return self.value.bit_length()
+        return self._len
 
     def __int__(self):
         return self.value
 
     @property
     def signed(self):
-        if self[self.size-1] == 1:
-            return self.value - (1 << self.size)
-        else:
-            return int(self)
+        sign = (self.value >> (self.size - 1)) & 1
+        return self.value - sign * self._full
 
     def resize(self, size):
-        return self.__class__(self.signed, size=size)
+        if size < self.size:
+            return self.__class__(self.signed, size=size)
+        result = self._fast(self.value, size)
+        if (self.value >> (self.size - 1)) & 1:
+            result.value |= result._full - self._full
+            result._signed = True
+        return result
 
     def add_alias(self, name, start, end=None):
         if end is not None:
@@ -287,130 +357,148 @@ class Bitslice(Integral):
         self._aliases[name] = val
 
     def _mask_shift_size(self, key):
-        if isinstance(key, str):
+        if type(key) is int:
+            return _mask_shift_size_int(key)
+        if type(key) is str:
             key = self._aliases[key]
-
+            if type(key) is int:
+                return _mask_shift_size_int(key)
         if isinstance(key, slice):
-            mask = ((1 << (key.start - key.stop) + 1) - 1) << key.stop
-            size = (key.start - key.stop) + 1
-            shift = key.stop
-        elif isinstance(key, int):
-            mask = 1 << key
-            size = 1
-            shift = key
-        return mask, shift, size
+            return _mask_shift_size_slice(index(key.start), index(key.stop))
+        return _mask_shift_size_int(index(key))
 
     def __getitem__(self, key):
         mask, shift, size = self._mask_shift_size(key)
-        return self.__class__((self.value & mask) >> shift, size=size)
+        return self._fast((self.value & mask) >> shift, size)
 
     def __setitem__(self, key, value):
         mask, shift, size = self._mask_shift_size(key)
-        mask_value = self.value & (mask ^ ((1 << len(self)) - 1))
-        self.value = mask_value | (int(value) << shift) & mask
+        full_mask = self._full_mask
+        if full_mask is None:
+            width = self._len
+            full_mask = _MASK_TABLE[width] if width < 129 else (1 << width) - 1
+        mask_value = self.value & (full_mask ^ mask)
+        self.value = mask_value | (_v(value) << shift) & mask
+        if self.size is None:
+            self._len = self.value.bit_length()
 
     def __add__(self, value):
-        return self.__class__(int(self) + int(value), size=len(self))
+        return self.__class__(self.value + _v(value), size=self._len)
 
     def __radd__(self, value):
-        return value + int(self)
+        return value + self.value
 
     def __sub__(self, value):
-        return self.__class__(int(self) - int(value), size=len(self))
+        return self.__class__(self.value - _v(value), size=self._len)
 
     def __rsub__(self, value):
-        return value - int(self)
+        return value - self.value
 
     def __mul__(self, value):
-        return self.__class__(int(self) * int(value), size=len(self))
+        return self.__class__(self.value * _v(value), size=self._len)
 
     def __rmul__(self, value):
-        return value * int(self)
+        return value * self.value
 
     def __truediv__(self, value):
-        return self.__class__(int(self) // int(value), size=len(self))
+        return self.__class__(self.value // _v(value), size=self._len)
 
     def __rtruediv__(self, value):
-        return value / int(self)
+        return value / self.value
 
     def __floordiv__(self, value):
-        return self.__class__(int(self) // int(value), size=len(self))
+        return self.__class__(self.value // _v(value), size=self._len)
 
     def __rfloordiv__(self, value):
-        return value // int(self)
+        return value // self.value
 
     def __and__(self, value):
-        return self.__class__(int(self) & int(value), size=len(self))
+        return self._fast(self.value & _v(value), self._len)
 
     def __rand__(self, value):
-        return value & int(self)
+        return value & self.value
 
     def __or__(self, value):
-        return self.__class__(int(self) | int(value), size=len(self))
+        v = _v(value)
+        if v >= 0 and v.bit_length() <= self._len:
+            return self._fast(self.value | v, self._len)
+        return self.__class__(self.value | v, size=self._len)
 
     def __ror__(self, value):
-        return value | int(self)
+        return value | self.value
 
     def __xor__(self, value):
-        return self.__class__(int(self) ^ int(value), size=len(self))
+        v = _v(value)
+        if v >= 0 and v.bit_length() <= self._len:
+            return self._fast(self.value ^ v, self._len)
+        return self.__class__(self.value ^ v, size=self._len)
 
     def __rxor__(self, value):
-        return value ^ int(self)
+        return value ^ self.value
 
     def __lshift__(self, value):
-        return self.__class__(int(self) << int(value), size=len(self))
+        return self.__class__(self.value << _v(value), size=self._len)
 
     def __rlshift__(self, value):
-        return value << int(self)
+        return value << self.value
 
     def __rshift__(self, value):
-        return self.__class__(int(self) >> int(value), size=len(self))
+        return self._fast(self.value >> _v(value), self._len)
 
     def __rrshift__(self, value):
-        return value >> int(self)
+        return value >> self.value
 
     def __invert__(self):
-        mask = (1 << len(self)) - 1
-        return self.__class__(int(self) ^ mask, size=len(self))
+        mask = self._full_mask
+        if mask is None:
+            width = self._len
+            mask = _MASK_TABLE[width] if width < 129 else (1 << width) - 1
+        return self._fast(self.value ^ mask, self._len)
 
     def __abs__(self):
-        return self.__class__(abs(int(self)), size=len(self))
+        return self.__class__(abs(self.value), size=self._len)
 
     def __ceil__(self):
-        return self.__class__(ceil(int(self)), size=len(self))
+        return self.__class__(ceil(self.value), size=self._len)
 
     def __floor__(self):
-        return self.__class__(floor(int(self)), size=len(self))
+        return self.__class__(floor(self.value), size=self._len)
 
     def __eq__(self, other):
-        return int(self) == other
+        return self.value == other
 
     def __le__(self, other):
-        return int(self) <= other
+        return self.value <= other
 
     def __lt__(self, other):
-        return int(self) < other
+        return self.value < other
 
     def __mod__(self, other):
-        return self.__class__(int(self) % other, size=len(self))
+        return self.__class__(self.value % other, size=self._len)
 
     def __rmod__(self, other):
-        return self.__class__(other % int(self), size=len(self))
+        return self.__class__(other % self.value, size=self._len)
 
     def __neg__(self):
-        return self.__class__(- int(self), size=len(self))
+        return self.__class__(- self.value, size=self._len)
 
     def __pos__(self):
-        return self.__class__(+ int(self), size=len(self))
+        return self.__class__(+ self.value, size=self._len)
 
     def __pow__(self, other, modulo=None):
-        return self.__class__(pow(int(self), other, modulo), size=len(self))
+        return self.__class__(pow(self.value, other, modulo), size=self._len)
 
     def __rpow__(self, other, modulo=None):
-        return self.__class__(pow(other, int(self), modulo), size=len(self))
+        return self.__class__(pow(other, self.value, modulo), size=self._len)
 
     def __round__(self):
-        return int(self)
+        return self.value
 
     def __trunc__(self, ndigits):
-        return trunc(int(self), ndigits)
+        return trunc(self.value, ndigits)
+
+
+def _v(value, _Bitslice=Bitslice):
+    if type(value) is _Bitslice:
+        return value.value
+    return value if type(value) is int else int(value)
@@ -0,0 +1,36 @@
+""" Build script for the optional Cython extension.
+    When Cython or a C compiler is not available, the pure Python package is
+    installed instead.
+"""
+from setuptools import Extension
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+BUILD_ERRORS = (CCompilerError, ExecError, PlatformError, OSError)
+
+
+class OptionalBuildExt(build_ext):
+    def run(self):
+        try:
+            super().run()
+        except BUILD_ERRORS:
+            pass
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except BUILD_ERRORS:
+            pass
+
+
+def build(setup_kwargs):
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        return
+
+    extensions = [Extension("bitslice._cython", ["bitslice/_cython.pyx"])]
+    setup_kwargs.update(
+        ext_modules=cythonize(extensions, language_level=3),
+        cmdclass={"build_ext": OptionalBuildExt},
+    )
@@ -0,0 +1,9 @@
+import importlib.util
+
+collect_ignore = []
+
+if importlib.util.find_spec("numpy") is None:
+    collect_ignore.append("bitslice/array.py")
+
+if importlib.util.find_spec("bitslice._cython") is None:
+    collect_ignore.append("tests/test_fastbitslice.py")
@@ -0,0 +1,101 @@
+import doctest
+
+import pytest
+
+from bitslice import Bitslice
+from bitslice import _cython
+from bitslice._cython import FastBitslice
+
+
+def test_doctests():
+    assert doctest.testmod(_cython).failed == 0
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "a + b",
+        "b - a",
+        "a - b",
+        "a * 3",
+        "b // 5",
+        "b / 5",
+        "a & b",
+        "a | b",
+        "a ^ b",
+        "a << 2",
+        "b >> 1",
+        "~a",
+        "-a",
+        "a % 4",
+        "a ** 2",
+        "a ** -1",
+        "1.5 ** a",
+        "a % 2.5",
+        "b % a",
+        "a - (-1)",
+        "a & (1 << 70)",
+        "a[3:1]",
+        "a[0]",
+    ],
+)
+def test_matches_bitslice(expr):
+    fast = eval(expr, {"a": FastBitslice(7, size=8), "b": FastBitslice(12, size=8)})
+    slow = eval(expr, {"a": Bitslice(7, size=8), "b": Bitslice(12, size=8)})
+    assert repr(fast) == repr(slow)
+    assert len(fast) == len(slow)
+
+
+@pytest.mark.parametrize(
+    "expr", ["a + 250", "a * 100", "a << 6", "a | 0x100", "a - 300"]
+)
+def test_overflow_raises(expr):
+    with pytest.raises(ValueError):
+        eval(expr, {"a": FastBitslice(7, size=8)})
+
+
+def test_signed():
+    assert repr(FastBitslice(-1, size=8)) == "0x00FF (-1)"
+    assert repr(FastBitslice(1, size=8) - 2) == "0x00FF (-1)"
+    assert FastBitslice(0x80, size=8).signed == -128
+    assert FastBitslice(1 << 63, size=64).signed == -(1 << 63)
+    assert repr(FastBitslice(-2, size=64)) == "0xFFFFFFFFFFFFFFFE (-2)"
+
+
+def test_resize():
+    a = FastBitslice(-2, size=3)
+    assert repr(a.resize(5)) == repr(Bitslice(-2, size=3).resize(5))
+    assert repr(a.resize(64)) == "0xFFFFFFFFFFFFFFFE (-2)"
+    assert repr(FastBitslice(3, size=3).resize(8)) == "0x0003 (3)"
+    with pytest.raises(ValueError):
+        FastBitslice(3, size=3).resize(1)
+
+
+def test_bool():
+    assert not FastBitslice(0, size=8)
+    assert not FastBitslice(4, size=8)[3]
+    assert FastBitslice(8, size=8)[3]
+
+
+def test_setitem():
+    a = FastBitslice(0, size=16)
+    a[7:4] = 0x1F
+    a[15] = True
+    a[3:0] = -1
+    assert int(a) == 0x80FF
+
+
+@pytest.mark.parametrize("key", [-1, 64, 1 << 70, slice(3, -1), slice(2, 5)])
+def test_invalid_key(key):
+    with pytest.raises(IndexError):
+        FastBitslice(7, size=8)[key]
+
+
+def test_too_wide():
+    with pytest.raises(ValueError):
+        FastBitslice(1, size=65)
+
+
+def test_requires_size():
+    with pytest.raises(TypeError):
+        FastBitslice(5)